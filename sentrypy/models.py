@@ -1,11 +1,15 @@
-from dataclasses import dataclass, field, InitVar
-from typing import Any, Dict, Iterator, List, Optional, Union
+from typing import Dict, Iterator, List, Optional, Union
 from enum import Enum
+from operator import itemgetter
 
-from sentrypy.transceiver import Transceiver
+from sentrypy.transceiver import API_URL, Transceiver
+
+_MISSING = object()
+"""Sentinel for keys absent from :attr:`BaseModel.json`."""
+
+_tag_key_value = itemgetter("key", "value")
 
 
-@dataclass
 class BaseModel:
     """Base class for all model classes like :class:`Project` or :class:`Event`.
 
@@ -27,8 +31,13 @@ class BaseModel:
         child_object["id"]
 
     As :class:`BaseModel` is inherited by all models, all children support this access styles.
+    Attributes defined on the class, like methods, take precedence over json keys of the same name.
     """
 
+    __slots__ = ("transceiver", "json")
+
+    _fields = ("transceiver", "json")
+
     transceiver: Transceiver
     """HTTP level API wrapper."""
 
@@ -39,6 +48,32 @@ class BaseModel:
 
     For more information see :class:`BaseModel` documentation."""
 
+    def __init__(self, transceiver: Transceiver, json: Dict):
+        self.transceiver = transceiver
+        self.json = json
+
+    @classmethod
+    def _from_json(cls, transceiver: Transceiver, json: Dict, **kwargs) -> "BaseModel":
+        """Instantiate from an API response, skipping ``__init__`` and its call chain"""
+        obj = object.__new__(cls)
+        obj.transceiver = transceiver
+        obj.json = json
+        if kwargs:
+            for key, value in kwargs.items():
+                setattr(obj, key, value)
+        return obj
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields)
+
+    __hash__ = None
+
     def __getitem__(self, key):
         """Implements bracket access to :attr:`json` as described in :class:`BaseModel`."""
 
@@ -47,19 +82,23 @@ class BaseModel:
 
     def __getattr__(self, key):
         """Implements dotted access to :attr:`json` as described in :class:`BaseModel`."""
-        # Only called if instance has no attribute named `key`
+        # Only called if instance has no attribute named `key`, so methods, slots and properties
+        # resolve at native speed and take precedence over json keys.
         # See: https://docs.python.org/3/reference/datamodel.html#object.__getattr__
-        # Implemented to allow simple access to json model attributes via dot: model.json_key
-        try:
-            return self.json[key]
-        except KeyError as e:
-            raise AttributeError(e)
+        if key == "json":
+            # Slot is unset, e.g. while unpickling, looking it up again would recurse
+            raise AttributeError(key)
+        value = self.json.get(key, _MISSING)
+        if value is _MISSING:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {key!r}")
+        return value
 
 
-@dataclass
 class Organization(BaseModel):
     """Implements an :class:`Organization`"""
 
+    __slots__ = ()
+
     def project(self, project_slug: str) -> "Project":
         """Get a specific :class:`Project`
 
@@ -69,7 +108,7 @@ class Organization(BaseModel):
         Official API Docs:
             `GET /api/0/projects/{organization_slug}/{project_slug}/ <https://docs.sentry.io/api/projects/retrieve-a-project/>`_
         """
-        endpoint = f"https://sentry.io/api/0/projects/{self.slug}/{project_slug}/"
+        endpoint = f"{API_URL}/projects/{self.slug}/{project_slug}/"
         return self.transceiver.get(endpoint, model=Project)
 
     def teams(self) -> Iterator["Team"]:
@@ -78,7 +117,7 @@ class Organization(BaseModel):
         Official API Docs:
             `GET /api/0/organizations/{organization_slug}/teams/ <https://docs.sentry.io/api/teams/list-an-organizations-teams/>`_
         """
-        endpoint = f"https://sentry.io/api/0/organizations/{self.slug}/teams/"
+        endpoint = f"{API_URL}/organizations/{self.slug}/teams/"
         return self.transceiver.paginate_get(endpoint, model=Team, organization_slug=self.slug)
 
     def team(self, team_slug: str) -> "Team":
@@ -90,7 +129,7 @@ class Organization(BaseModel):
         Official API Docs:
             `GET /api/0/teams/{organization_slug}/{team_slug}/ <https://docs.sentry.io/api/teams/retrieve-a-team/>`_
         """
-        endpoint = f"https://sentry.io/api/0/teams/{self.slug}/{team_slug}/"
+        endpoint = f"{API_URL}/teams/{self.slug}/{team_slug}/"
         return self.transceiver.get(endpoint, model=Team, organization_slug=self.slug)
 
     def create_team(self, team_slug: str) -> "Team":
@@ -102,7 +141,7 @@ class Organization(BaseModel):
         Official API Docs:
             `POST /api/0/organizations/{organization_slug}/teams/ <https://docs.sentry.io/api/teams/create-a-new-team/>`_
         """
-        endpoint = f"https://sentry.io/api/0/organizations/{self.slug}/teams/"
+        endpoint = f"{API_URL}/organizations/{self.slug}/teams/"
         data = {"slug": team_slug}
         return self.transceiver.post(endpoint, data=data, model=Team, organization_slug=self.slug)
 
@@ -115,7 +154,7 @@ class Organization(BaseModel):
         Official API Docs:
             `GET /api/0/organizations/{organization_slug}/issues/{issue_id}/ <https://docs.sentry.io/api/events/retrieve-an-issue/>`_
         """
-        endpoint = f"https://sentry.io/api/0/organizations/{self.slug}/issues/{id}/"
+        endpoint = f"{API_URL}/organizations/{self.slug}/issues/{id}/"
         return self.transceiver.get(endpoint, model=Issue, organization_slug=self.slug)
 
     def integrations(
@@ -130,38 +169,53 @@ class Organization(BaseModel):
         Official API Docs:
             `GET  /api/0/organizations/{organization_slug}/integrations/ <https://docs.sentry.io/api/integrations/list-an-organizations-available-integrations/>`_
         """
-        endpoint = f"https://sentry.io/api/0/organizations/{self.slug}/integrations/"
+        endpoint = f"{API_URL}/organizations/{self.slug}/integrations/"
         print(endpoint)
 
         params_map = {"providerKey": provider_key, "features": features}
-        params = {key: value for key, value in params_map.items() if value is not None}
+        params = {key: value for key, value in params_map.items() if value is not None} or None
         return self.transceiver.paginate_get(endpoint, params=params, model=Integration)
 
 
-@dataclass
 class Integration(BaseModel):
     """Implements an :class:`Integration`"""
 
-    pass
+    __slots__ = ()
 
 
-@dataclass
 class Team(BaseModel):
     """Implements a :class:`Team`"""
 
+    __slots__ = ("organization_slug",)
+
+    _fields = BaseModel._fields + ("organization_slug",)
+
     organization_slug: str
 
+    def __init__(self, transceiver: Transceiver, json: Dict, organization_slug: str):
+        self.transceiver = transceiver
+        self.json = json
+        self.organization_slug = organization_slug
+
+    @classmethod
+    def _from_json(cls, transceiver: Transceiver, json: Dict, organization_slug: str):
+        """Instantiate from an API response, assigning all slots directly"""
+        obj = object.__new__(cls)
+        obj.transceiver = transceiver
+        obj.json = json
+        obj.organization_slug = organization_slug
+        return obj
+
     def delete(self):
         """Delete this :class:`Team`
 
         Official API Docs:
             `DELETE /api/0/teams/{organization_slug}/{team_slug}/ <https://docs.sentry.io/api/teams/delete-a-team/>`_
         """
-        endpoint = f"https://sentry.io/api/0/teams/{self.organization_slug}/{self.slug}/"
+        endpoint = f"{API_URL}/teams/{self.organization_slug}/{self.slug}/"
         return self.transceiver.delete(endpoint)
 
 
-@dataclass
 class Project(BaseModel):
     """Implements a :class:`Project`"""
 
@@ -175,9 +229,37 @@ class Project(BaseModel):
         HOUR = "1h"
         DAY = "1d"
 
+    # Derived values, computed on first access, None until then
+    __slots__ = ("_organization_slug", "_project_endpoint")
+
+    def __init__(self, transceiver: Transceiver, json: Dict):
+        self.transceiver = transceiver
+        self.json = json
+        self._organization_slug = None
+        self._project_endpoint = None
+
+    @classmethod
+    def _from_json(cls, transceiver: Transceiver, json: Dict):
+        """Instantiate from an API response, assigning all slots directly"""
+        obj = object.__new__(cls)
+        obj.transceiver = transceiver
+        obj.json = json
+        obj._organization_slug = None
+        obj._project_endpoint = None
+        return obj
+
+    @property
+    def organization_slug(self) -> str:
+        if self._organization_slug is None:
+            self._organization_slug = self.organization["slug"]
+        return self._organization_slug
+
     @property
-    def organization_slug(self):
-        return self.organization["slug"]
+    def _endpoint(self) -> str:
+        """Base URL of all endpoints of this project"""
+        if self._project_endpoint is None:
+            self._project_endpoint = f"{API_URL}/projects/{self.organization_slug}/{self.slug}"
+        return self._project_endpoint
 
     def issues(self, query: Optional[str] = "unresolved") -> Iterator["Issue"]:
         """Get an iterator of all or specified :class:`Issues <Issue>` in the :class:`Project`
@@ -189,7 +271,7 @@ class Project(BaseModel):
         Official API Docs:
             `GET /api/0/projects/{organization_slug}/{project_slug}/issues/ <https://docs.sentry.io/api/events/list-a-projects-issues/>`_
         """
-        endpoint = f"https://sentry.io/api/0/projects/{self.organization_slug}/{self.slug}/issues/"
+        endpoint = f"{self._endpoint}/issues/"
         params_map = {"query": "" if query is None else f"is:{query}"}
         params = {key: value for key, value in params_map.items() if value is not None}
         return self.transceiver.paginate_get(
@@ -204,12 +286,26 @@ class Project(BaseModel):
         Args:
             resolution: Aggregate counts according to set value of :class:`Project.EventResolution`
         """
-        endpoint = f"https://sentry.io/api/0/projects/{self.organization_slug}/{self.slug}/stats/"
-        params = dict()
-        if resolution is not None:
-            params["resolution"] = resolution.value
+        endpoint = f"{self._endpoint}/stats/"
+        params = None if resolution is None else {"resolution": resolution.value}
         return self.transceiver.get(endpoint, params=params)
 
+    def event_counts_array(self, resolution: Optional[EventResolution] = None) -> "numpy.ndarray":
+        """Get event counts of project as :mod:`numpy` array for vectorized aggregation
+
+        Requires the optional dependency numpy, e.g. ``pip install sentrypy[numpy]``.
+
+        Args:
+            resolution: Aggregate counts according to set value of :class:`Project.EventResolution`
+
+        Returns:
+            Integer array of shape ``(N, 2)`` with one ``[timestamp, count]`` row per time bucket
+        """
+        import numpy
+
+        counts = self.event_counts(resolution=resolution)
+        return numpy.asarray(counts, dtype=numpy.int64).reshape(-1, 2)
+
     def tag_values(self, key: str) -> List[Dict]:
         """Get all tag values of the project
 
@@ -219,7 +315,7 @@ class Project(BaseModel):
         Official API Docs:
             `GET /api/0/projects/{organization_slug}/{project_slug}/tags/{key}/values/ <https://docs.sentry.io/api/projects/list-a-tags-values/>`_
         """
-        endpoint = f"https://sentry.io/api/0/projects/{self.organization_slug}/{self.slug}/tags/{key}/values/"
+        endpoint = f"{self._endpoint}/tags/{key}/values/"
         return self.transceiver.get(endpoint)
 
     def update_issues(
@@ -271,11 +367,11 @@ class Project(BaseModel):
         Official API Docs:
             `PUT /api/0/projects/{organization_slug}/{project_slug}/issues/ <https://docs.sentry.io/api/events/bulk-mutate-a-list-of-issues/>`_
         """
-        endpoint = f"https://sentry.io/api/0/projects/{self.organization_slug}/{self.slug}/issues/"
+        endpoint = f"{self._endpoint}/issues/"
 
         # How to use the same parameter multiple times: https://stackoverflow.com/a/23384253
         params_map = {"id": by_id, "status": by_status}
-        params = {key: value for key, value in params_map.items() if value is not None}
+        params = {key: value for key, value in params_map.items() if value is not None} or None
         data_map = {
             "status": status,
             "statusDetails": status_details,
@@ -290,12 +386,29 @@ class Project(BaseModel):
         return self.transceiver.put(endpoint, params=params, data=data)
 
 
-@dataclass
 class Issue(BaseModel):
     """Implements an :class:`Issue`"""
 
+    __slots__ = ("organization_slug",)
+
+    _fields = BaseModel._fields + ("organization_slug",)
+
     organization_slug: str
 
+    def __init__(self, transceiver: Transceiver, json: Dict, organization_slug: str):
+        self.transceiver = transceiver
+        self.json = json
+        self.organization_slug = organization_slug
+
+    @classmethod
+    def _from_json(cls, transceiver: Transceiver, json: Dict, organization_slug: str):
+        """Instantiate from an API response, assigning all slots directly"""
+        obj = object.__new__(cls)
+        obj.transceiver = transceiver
+        obj.json = json
+        obj.organization_slug = organization_slug
+        return obj
+
     def events(self, full: bool = False) -> Iterator["Event"]:
         """Get an iterator of all :class:`Events <Event>` of this :class:`Issue`
 
@@ -305,7 +418,7 @@ class Issue(BaseModel):
         Official API Docs:
             `GET /api/0/organizations/{organization_slug}/issues/{issue_id}/events/ <https://docs.sentry.io/api/events/list-an-issues-events/>`_
         """
-        endpoint = f"https://sentry.io/api/0/organizations/{self.organization_slug}/issues/{self.id}/events/"
+        endpoint = f"{API_URL}/organizations/{self.organization_slug}/issues/{self.id}/events/"
         params = {"full": full}
         return self.transceiver.paginate_get(endpoint, params=params, model=Event)
 
@@ -354,23 +467,38 @@ class Issue(BaseModel):
         }
         data = {key: value for key, value in data_map.items() if value is not None}
 
-        endpoint = (
-            f"https://sentry.io/api/0/organizations/{self.organization_slug}/issues/{self.id}/"
-        )
+        endpoint = f"{API_URL}/organizations/{self.organization_slug}/issues/{self.id}/"
         return self.transceiver.put(
             endpoint, data=data, model=Issue, organization_slug=self.organization_slug
         )
 
 
-@dataclass
 class Event(BaseModel):
     """Implements an :class:`Event`"""
 
+    # Tags mapping, computed on first access, None until then
+    __slots__ = ("_tags",)
+
+    def __init__(self, transceiver: Transceiver, json: Dict):
+        self.transceiver = transceiver
+        self.json = json
+        self._tags = None
+
+    @classmethod
+    def _from_json(cls, transceiver: Transceiver, json: Dict):
+        """Instantiate from an API response, assigning all slots directly"""
+        obj = object.__new__(cls)
+        obj.transceiver = transceiver
+        obj.json = json
+        obj._tags = None
+        return obj
+
     @property
-    def tags(self):
-        return {tag["key"]: tag["value"] for tag in self.json["tags"]}
+    def tags(self) -> Dict:
+        if self._tags is None:
+            self._tags = dict(map(_tag_key_value, self.json["tags"]))
+        return self._tags
 
 
-@dataclass
 class EventCount(BaseModel):
-    pass
+    __slots__ = ()
@@ -1,7 +1,7 @@
-from dataclasses import dataclass, field, InitVar
-from typing import Any, Dict, Iterator, List, Optional, Union
+from dataclasses import dataclass, field
+from typing import Iterator
 
-from sentrypy.transceiver import Transceiver
+from sentrypy.transceiver import API_URL, Transceiver
 from sentrypy.models import (
     Organization,
     Project,
@@ -14,13 +14,16 @@ class Sentry:
 
     Args:
         token: Your Sentry API token
+        etag_cache_bytes: Total size of get responses kept for revalidation via ETags, 0 disables
+            caching
     """
 
     token: str
+    etag_cache_bytes: int = 0
     transceiver: Transceiver = field(init=False)
 
     def __post_init__(self):
-        self.transceiver = Transceiver(token=self.token)
+        self.transceiver = Transceiver(token=self.token, etag_cache_bytes=self.etag_cache_bytes)
 
     def organization(self, organization_slug: str) -> Organization:
         """Get a specific :class:`Organization`
@@ -31,7 +34,7 @@ class Sentry:
         Official API Docs:
             `GET /api/0/organizations/{organization_slug}/ <https://docs.sentry.io/api/organizations/retrieve-an-organization/>`_
         """
-        endpoint = f"https://sentry.io/api/0/organizations/{organization_slug}/"
+        endpoint = f"{API_URL}/organizations/{organization_slug}/"
         return self.transceiver.get(endpoint, model=Organization)
 
     def projects(self) -> Iterator[Project]:
@@ -40,5 +43,5 @@ class Sentry:
         Official API Docs:
             `GET /api/0/projects/ <https://docs.sentry.io/api/projects/list-your-projects>`_
         """
-        endpoint = "https://sentry.io/api/0/projects/"
+        endpoint = f"{API_URL}/projects/"
         return self.transceiver.paginate_get(endpoint, model=Project)
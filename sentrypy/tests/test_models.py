@@ -0,0 +1,112 @@
+import pickle
+
+import pytest
+
+from sentrypy.models import Event, Issue, Organization, Project
+from sentrypy.transceiver import Transceiver
+
+
+def test_attribute_access():
+    """Verify that json keys are accessible via dot and brackets"""
+    organization = Organization(transceiver=Transceiver(token="the_token"), json={"slug": "org"})
+    assert organization.slug == "org"
+    assert organization["slug"] == "org"
+    with pytest.raises(AttributeError, match="'Organization' object has no attribute 'missing'"):
+        organization.missing
+    with pytest.raises(KeyError):
+        organization["missing"]
+
+
+def test_class_attributes_take_precedence():
+    """Verify that json keys do not shadow methods and fields of the model"""
+    json = {"id": 1, "teams": [], "organization_slug": "shadowed"}
+    transceiver = Transceiver(token="the_token")
+    organization = Organization(transceiver=transceiver, json=json)
+    assert callable(organization.teams)
+    issue = Issue(transceiver=transceiver, json=json, organization_slug="org")
+    assert issue.organization_slug == "org"
+    assert issue.id == 1
+
+
+def test_project_organization_slug_is_cached():
+    """Verify that the organization slug is derived once per project"""
+    json = {"slug": "proj", "organization": {"slug": "org"}}
+    project = Project(transceiver=Transceiver(token="the_token"), json=json)
+    assert project.organization_slug == "org"
+    json["organization"] = {"slug": "changed"}
+    assert project.organization_slug == "org"
+
+
+def test_from_json_matches_constructor():
+    """Verify that the fast factory builds the same model as the constructor"""
+    transceiver = Transceiver(token="the_token")
+    kwargs = dict(transceiver=transceiver, json={"id": 1}, organization_slug="org")
+    assert Issue._from_json(**kwargs) == Issue(**kwargs)
+
+
+def test_event_tags():
+    """Verify that event tags are mapped from key to value"""
+    json = {"tags": [{"key": "level", "value": "error"}, {"key": "os", "value": "linux"}]}
+    event = Event(transceiver=Transceiver(token="the_token"), json=json)
+    assert event.tags == {"level": "error", "os": "linux"}
+    assert event.tags is event.tags
+
+
+def test_models_have_no_dict():
+    """Verify that models store their fields and cached values in slots only"""
+    transceiver = Transceiver(token="the_token")
+    json = {"slug": "proj", "organization": {"slug": "org"}, "tags": []}
+    models = [
+        Organization(transceiver=transceiver, json=json),
+        Issue(transceiver=transceiver, json=json, organization_slug="org"),
+        Project._from_json(transceiver=transceiver, json=json),
+        Event._from_json(transceiver=transceiver, json=json),
+    ]
+    for model in models:
+        assert not hasattr(model, "__dict__")
+    assert models[2].organization_slug == "org"
+    assert models[3].tags == {}
+
+
+def test_project_endpoints(mocker):
+    """Verify that project endpoints are built from organization and project slug"""
+    json = {"slug": "proj", "organization": {"slug": "org"}}
+    transceiver = Transceiver(token="the_token")
+    mocker.patch.object(transceiver, "get")
+    Project(transceiver=transceiver, json=json).tag_values("level")
+    endpoint = "https://sentry.io/api/0/projects/org/proj/tags/level/values/"
+    transceiver.get.assert_called_with(endpoint)
+
+
+@pytest.mark.parametrize(
+    "counts, shape",
+    [([[1700000000, 3], [1700003600, 0], [1700007200, 5]], (3, 2)), ([], (0, 2))],
+)
+def test_project_event_counts_array(mocker, counts, shape):
+    """Verify that event counts are returned as integer array with one row per time bucket"""
+    numpy = pytest.importorskip("numpy")
+    transceiver = Transceiver(token="the_token")
+    mocker.patch.object(transceiver, "get", return_value=counts)
+    json = {"slug": "proj", "organization": {"slug": "org"}}
+    project = Project(transceiver=transceiver, json=json)
+    array = project.event_counts_array()
+    assert array.dtype == numpy.int64
+    assert array.shape == shape
+    assert array.tolist() == counts
+
+
+def test_class_attributes_added_later(mocker):
+    """Verify that attributes added to a model class after its creation are found"""
+    organization = Organization(transceiver=Transceiver(token="the_token"), json={})
+    mocker.patch.object(Organization, "extra", create=True, new=lambda self: 1)
+    assert organization.extra() == 1
+    mocker.patch.object(Organization, "slug", create=True, new="patched")
+    assert organization.slug == "patched"
+
+
+def test_integrations_without_filters_sends_no_params(mocker):
+    """Verify that unset filters result in no query string instead of an empty dict"""
+    transceiver = Transceiver(token="the_token")
+    mocker.patch.object(transceiver, "paginate_get")
+    Organization(transceiver=transceiver, json={"slug": "org"}).integrations()
+    assert transceiver.paginate_get.call_args.kwargs["params"] is None
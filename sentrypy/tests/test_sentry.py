@@ -0,0 +1,8 @@
+from sentrypy import Sentry
+
+
+def test_etag_cache_bytes_passed_to_transceiver():
+    """Verify that the ETag cache can be enabled from the top-level client"""
+    assert Sentry(token="the_token").transceiver.etag_cache_bytes == 0
+    sentry = Sentry(token="the_token", etag_cache_bytes=1024)
+    assert sentry.transceiver.etag_cache_bytes == 1024
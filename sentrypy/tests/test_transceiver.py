@@ -1,16 +1,208 @@
+import io
+import json
+import os
+import signal
+
+import pytest
 import requests
 
-from sentrypy.transceiver import Transceiver
+from sentrypy.transceiver import PaginationLink, ResponseAttribute, Transceiver
+
+
+def make_response(body, status_code=200):
+    """Build a mocked response with a json body"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode()
+    response.raw = io.BytesIO(response._content)
+    return response
+
+
+def make_page(items, next_url, results):
+    """Build a mocked response of a paginated endpoint"""
+    response = make_response(items)
+    response.headers["Link"] = (
+        f'<{next_url}>; rel="previous"; results="false"; cursor="0:0:1", '
+        f'<{next_url}>; rel="next"; results="{str(results).lower()}"; cursor="0:100:0"'
+    )
+    return response
 
 
 def test_get_request_call(mocker):
-    """Verify that ``requests.get`` is called with the right arguments"""
+    """Verify that ``requests.Session.get`` is called with the right arguments"""
     token = "the_token"
     endpoint = "the_endpoint"
     params = {"param": "value"}
-    expected_header = {"Authorization": f"Bearer {token}"}
 
-    mocker.patch("requests.get")
+    mocker.patch("requests.Session.get", return_value=make_response({}))
     handler = Transceiver(token=token)
     handler.get(endpoint, params=params)
-    requests.get.assert_called_with(url=endpoint, headers=expected_header, params=params)
+    requests.Session.get.assert_called_with(url=endpoint, params=params, stream=False)
+
+
+def test_session_auth_header():
+    """Verify that the session sends the token with every request"""
+    token = "the_token"
+    handler = Transceiver(token=token)
+    assert handler.session.headers["Authorization"] == handler.auth_headers["Authorization"]
+    assert handler.auth_headers == {"Authorization": f"Bearer {token}"}
+    assert Transceiver(token=token).auth_headers is handler.auth_headers
+    with pytest.raises(TypeError):
+        handler.auth_headers["Authorization"] = "Bearer other_token"
+
+
+@pytest.mark.parametrize("prefetch", [True, False])
+def test_paginate_get_follows_links(mocker, prefetch):
+    """Verify that all pages are walked in order until no more results are announced"""
+    pages = [
+        make_page([1, 2], "page_2", True),
+        make_page([3], "page_3", True),
+        make_page([], "page_4", False),
+    ]
+    mocker.patch("requests.Session.get", autospec=True, side_effect=pages)
+    handler = Transceiver(token="the_token")
+    items = list(handler.paginate_get("page_1", prefetch=prefetch))
+    assert items == [1, 2, 3]
+    urls = [call.kwargs["url"] for call in requests.Session.get.call_args_list]
+    assert urls == ["page_1", "page_2", "page_3"]
+    sessions = {call.args[0] for call in requests.Session.get.call_args_list}
+    assert (handler.session in sessions) is not prefetch
+
+
+def test_paginate_get_stream(mocker):
+    """Verify that streamed pages are decoded incrementally and closed afterwards"""
+    pytest.importorskip("ijson")
+    pages = [make_page([{"id": 1}, {"id": 2}], "page_2", False)]
+    mocker.patch("requests.Session.get", side_effect=pages)
+    handler = Transceiver(token="the_token")
+    assert list(handler.paginate_get("page_1", stream=True)) == [{"id": 1}, {"id": 2}]
+    requests.Session.get.assert_called_with(url="page_1", params=None, stream=True)
+    assert pages[0].raw.closed
+
+
+def test_failed_stream_is_closed(mocker):
+    """Verify that a streamed response failing its status check releases its connection"""
+    response = make_response({}, status_code=404)
+    mocker.patch("requests.Session.get", return_value=response)
+    handler = Transceiver(token="the_token")
+    with pytest.raises(requests.HTTPError):
+        handler.get("the_endpoint", stream=True)
+    assert response.raw.closed
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_paginate_get_prefetch_after_fork(mocker):
+    """Verify that prefetching still works in a process forked after a paginated walk"""
+    mocker.patch("requests.Session.get", side_effect=lambda **_: make_page([1], "next", False))
+    handler = Transceiver(token="the_token")
+    assert list(handler.paginate_get("page_1")) == [1]
+    pid = os.fork()
+    if pid == 0:
+        # Child process, a hanging walk is ended by the alarm signal
+        signal.alarm(5)
+        code = 1
+        try:
+            code = 0 if list(handler.paginate_get("page_1")) == [1] else 1
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+
+def test_paginate_get_max_results(mocker):
+    """Verify that pagination stops after ``max_results`` items"""
+    pages = [make_page([1, 2], "page_2", True), make_page([3], "page_3", False)]
+    mocker.patch("requests.Session.get", side_effect=pages)
+    handler = Transceiver(token="the_token")
+    assert list(handler.paginate_get("page_1", max_results=1)) == [1]
+
+
+def test_get_revalidates_etag(mocker):
+    """Verify that a repeated get sends the ETag and reuses the cached body on 304"""
+    first = make_response({"id": 1})
+    first.headers["ETag"] = '"abc"'
+    mocker.patch("requests.Session.get", side_effect=[first, make_response(None, 304)])
+    handler = Transceiver(token="the_token", etag_cache_bytes=1024)
+    assert handler.get("the_endpoint") == {"id": 1}
+    assert handler.get("the_endpoint") == {"id": 1}
+    requests.Session.get.assert_called_with(
+        url="the_endpoint", params=None, headers={"If-None-Match": '"abc"'}
+    )
+
+
+def test_paginate_get_batch(mocker):
+    """Verify that results are collected column by column, missing keys filled with None"""
+    pages = [make_page([{"id": 1}, {"id": 2, "level": "error"}], "page_2", False)]
+    mocker.patch("requests.Session.get", side_effect=pages)
+    handler = Transceiver(token="the_token")
+    table = handler.paginate_get_batch("page_1")
+    assert table == {"id": [1, 2], "level": [None, "error"]}
+
+
+@pytest.mark.parametrize(
+    "direction, expected",
+    [
+        ("previous", PaginationLink(url="prev_url", results=False, rel="previous", cursor="0:0:1")),
+        ("next", PaginationLink(url="next_url", results=True, rel="next", cursor="0:100:0")),
+    ],
+)
+def test_pagination_link_from_header(direction, expected):
+    """Verify that previous and next links are parsed from the header"""
+    header = {
+        "link": '<prev_url>; rel="previous"; results="false"; cursor="0:0:1", '
+        '<next_url>; rel="next"; results="true"; cursor="0:100:0"'
+    }
+    assert PaginationLink.from_header(header, direction=direction) == expected
+
+
+def test_etag_cache_is_bounded_by_bytes(mocker):
+    """Verify that the least recently used bodies are evicted beyond the byte limit"""
+    responses = []
+    for index in range(3):
+        response = make_response({"id": index})
+        response.headers["ETag"] = f'"{index}"'
+        responses.append(response)
+    mocker.patch("requests.Session.get", side_effect=responses)
+    size = len(responses[0].content)
+    handler = Transceiver(token="the_token", etag_cache_bytes=2 * size)
+    for index in range(3):
+        handler.get(f"endpoint_{index}")
+    assert [key[0] for key in handler._etag_cache] == ["endpoint_1", "endpoint_2"]
+    assert handler._etag_cache_used == 2 * size
+
+
+def test_paginate_get_bypasses_etag_cache(mocker):
+    """Verify that pages of a paginated walk are not kept in the cache"""
+    page = make_page([1], "page_2", False)
+    page.headers["ETag"] = '"abc"'
+    mocker.patch("requests.Session.get", side_effect=[page])
+    handler = Transceiver(token="the_token", etag_cache_bytes=1024)
+    assert list(handler.paginate_get("page_1")) == [1]
+    assert not handler._etag_cache
+
+
+def test_get_invalid_json_raises_request_exception(mocker):
+    """Verify that a body which is no json fails like ``Response.json``"""
+    response = make_response({})
+    response._content = b"<html>"
+    mocker.patch("requests.Session.get", return_value=response)
+    handler = Transceiver(token="the_token")
+    with pytest.raises(requests.JSONDecodeError) as info:
+        handler.get("the_endpoint")
+    assert isinstance(info.value, requests.RequestException)
+    assert info.value.response is response
+
+
+def test_etag_cache_headers_are_copies(mocker):
+    """Verify that modifying returned headers does not alter the cached headers"""
+    first = make_response({"id": 1})
+    first.headers["ETag"] = '"abc"'
+    responses = [first, make_response(None, 304), make_response(None, 304)]
+    mocker.patch("requests.Session.get", side_effect=responses)
+    handler = Transceiver(token="the_token", etag_cache_bytes=1024)
+    handler.get("the_endpoint", response_attribute=ResponseAttribute.HEADERS)["ETag"] = "changed"
+    cached = handler.get("the_endpoint", response_attribute=ResponseAttribute.HEADERS)
+    cached["ETag"] = "changed"
+    assert (
+        handler.get("the_endpoint", response_attribute=ResponseAttribute.HEADERS)["ETag"] == '"abc"'
+    )
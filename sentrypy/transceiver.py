@@ -1,7 +1,28 @@
+import os
+import re
 import requests
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, Iterator, List, Optional
+from functools import lru_cache
+from json import JSONDecodeError
+from threading import Lock
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+try:
+    # Optional, decodes large paginated responses considerably faster
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+API_URL = "https://sentry.io/api/0"
+"""Base URL of all API endpoints."""
 
 ResponseAttribute = Enum("ResponseContent", ["ALL", "JSON", "HEADERS"])
 
@@ -9,10 +30,74 @@ ResponseAttribute = Enum("ResponseContent", ["ALL", "JSON", "HEADERS"])
 @dataclass
 class Transceiver:
     token: str
+    etag_cache_bytes: int = 0
+    """Total size of get response bodies kept for revalidation via ``If-None-Match``.
+
+    Caching is disabled by default. Paginated and streamed requests are never cached."""
+
+    session: requests.Session = field(init=False, repr=False, compare=False)
+    """Persistent HTTP session reusing connections to the API across requests."""
+
+    _etag_cache: OrderedDict = field(init=False, repr=False, compare=False)
+    _etag_cache_used: int = field(init=False, repr=False, compare=False)
+    _etag_lock: Lock = field(init=False, repr=False, compare=False)
+
+    _prefetcher: Optional[Tuple[int, ThreadPoolExecutor, requests.Session]] = field(
+        init=False, repr=False, compare=False
+    )
+    _prefetch_lock: Lock = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.session = self._new_session()
+
+        # Least recently used get responses by request, guarded as pages are fetched in threads
+        self._etag_cache = OrderedDict()
+        self._etag_cache_used = 0
+        self._etag_lock = Lock()
+
+        # Created on first use of paginate_get, see _prefetch_worker
+        self._prefetcher = None
+        self._prefetch_lock = Lock()
+
+    def _new_session(self) -> requests.Session:
+        """Create an authenticated session"""
+        # Keep-alive and connection pooling amortize the TCP and TLS handshake over all requests
+        session = requests.Session()
+        session.headers.update(self.auth_headers)
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+        session.mount("https://", adapter)
+        return session
+
+    def _prefetch_worker(self) -> Tuple[ThreadPoolExecutor, requests.Session]:
+        """Get the thread and session fetching pages in the background, created once per process
+
+        A thread pool copied by ``os.fork`` believes its workers are still alive although none runs
+        in the child, so a forked process gets a new one. The worker has its own session, as a
+        :class:`requests.Session` is not guaranteed to be thread-safe.
+        """
+        with self._prefetch_lock:
+            if self._prefetcher is None or self._prefetcher[0] != os.getpid():
+                executor = ThreadPoolExecutor(max_workers=1)
+                self._prefetcher = (os.getpid(), executor, self._new_session())
+            return self._prefetcher[1:]
+
+    def __getstate__(self) -> Dict:
+        # Sessions, cache, prefetch worker and locks are rebuilt on unpickling, locks cannot be pickled
+        return {"token": self.token, "etag_cache_bytes": self.etag_cache_bytes}
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self.__post_init__()
 
     @property
-    def auth_headers(self) -> Dict:
-        return {"Authorization": f"Bearer {self.token}"}
+    def auth_headers(self) -> Mapping[str, str]:
+        return _auth_headers(self.token)
 
     def get(
         self,
@@ -21,6 +106,8 @@ class Transceiver:
         params: Optional[Dict] = None,
         response_attribute: Optional[ResponseAttribute] = ResponseAttribute.JSON,
         model: Optional[type] = None,
+        stream: bool = False,
+        cache: bool = True,
         **kwargs,
     ):
         """Perform authenticated get request and return selected attribute of HTTP response
@@ -30,23 +117,68 @@ class Transceiver:
             params: Parameters to add to endpoint
             response_attribute: Which part of the HTTP response to return
             model: If response_attribute is JSON, which class to instantiate
+            stream: Defer downloading the body, responses are then never cached
+            cache: Revalidate and keep the response via its ETag, if enabled by
+                :attr:`etag_cache_bytes`
             **kwargs: Additional arguments for model class constructor
         """
-        response = requests.get(url=endpoint, headers=self.auth_headers, params=params)
-        response.raise_for_status()
+        if cache and not stream and self.etag_cache_bytes > 0:
+            response = self._cached_get(endpoint, params=params)
+        else:
+            response = _send_get(self.session, endpoint, params=params, stream=stream)
 
         # Return only parts of response that have been selected by response_attribute
         attr_mapper = {
             ResponseAttribute.ALL: lambda x: x,
-            ResponseAttribute.JSON: lambda x: x.json(),
+            ResponseAttribute.JSON: _decode_json,
             ResponseAttribute.HEADERS: lambda x: x.headers,
         }
         result = attr_mapper[response_attribute](response)
         if response_attribute == ResponseAttribute.JSON and model is not None:
-            return model(transceiver=self, json=result, **kwargs)
+            return model._from_json(transceiver=self, json=result, **kwargs)
         else:
             return result
 
+    def _cached_get(self, endpoint: str, *, params: Optional[Dict] = None) -> requests.Response:
+        """Perform get request, revalidating a cached response by its ETag
+
+        If the API answers ``304 Not Modified`` a response is rebuilt from the cached body and
+        headers, which saves transferring the body again.
+        """
+        key = _request_key(endpoint, params)
+        with self._etag_lock:
+            cached = self._etag_cache.get(key)
+        headers = None if cached is None else {"If-None-Match": cached[0]}
+
+        response = self.session.get(url=endpoint, params=params, headers=headers)
+        if cached is not None and response.status_code == 304:
+            with self._etag_lock:
+                if key in self._etag_cache:
+                    self._etag_cache.move_to_end(key)
+            _, content, cached_headers = cached
+            response.status_code = 200
+            response._content = content
+            # Copied so that callers modifying the headers cannot alter the cache
+            response.headers = CaseInsensitiveDict(cached_headers)
+            return response
+        response.raise_for_status()
+
+        etag = response.headers.get("ETag")
+        size = len(response.content)
+        if etag is not None and size <= self.etag_cache_bytes:
+            with self._etag_lock:
+                previous = self._etag_cache.pop(key, None)
+                if previous is not None:
+                    self._etag_cache_used -= len(previous[1])
+                # Only body and headers are kept, not the response with its request and connection
+                headers = CaseInsensitiveDict(response.headers)
+                self._etag_cache[key] = (etag, response.content, headers)
+                self._etag_cache_used += size
+                while self._etag_cache_used > self.etag_cache_bytes:
+                    _, (_, content, _) = self._etag_cache.popitem(last=False)
+                    self._etag_cache_used -= len(content)
+        return response
+
     def paginate_get(
         self,
         endpoint,
@@ -54,6 +186,8 @@ class Transceiver:
         params: Optional[Dict] = None,
         model: Optional[type] = None,
         max_results: int = None,
+        prefetch: bool = True,
+        stream: bool = False,
         **kwargs,
     ) -> Iterator:
         """Paginate endpoint and generate model instances
@@ -63,26 +197,91 @@ class Transceiver:
             params: Parameters to append to endpoint url
             model: Instantiates objects from this class
             max_results: Return no more objects, unlimited by default
+            prefetch: Fetch the next page in a background thread with its own session while the
+                current one is consumed
+            stream: Decode each page incrementally while it is downloaded, keeping memory bounded
+                for large pages, requires the optional dependency ijson
             **kwargs: Additional arguments for model class constructor
         """
         # Implementation inspired from: https://www.pretzellogix.net/2021/12/19/step-13-paging-the-endpoints/
-        if params is None:
-            params = dict()
+
+        if prefetch:
+            executor, session = self._prefetch_worker()
+        else:
+            executor, session = None, self.session
+
+        def fetch(url: str) -> requests.Response:
+            # Paginated walks bypass the ETag cache
+            return _send_get(session, url, params=params, stream=stream)
+
         counter = 0
+        pending = executor.submit(fetch, endpoint) if prefetch else None
         plink = PaginationLink(url=endpoint, results=True)
-        while plink.results:
-            response = self.get(
-                endpoint=plink.url, response_attribute=ResponseAttribute.ALL, params=params
-            )
-            plink = PaginationLink.from_header(response.headers, direction="next")
-            for item in response.json():
-                if model is None:
-                    yield item
+        try:
+            while plink.results:
+                if prefetch:
+                    response, pending = pending.result(), None
                 else:
-                    yield model(transceiver=self, json=item, **kwargs)
-                counter += 1
-                if max_results is not None and counter >= max_results:
-                    return
+                    response = fetch(plink.url)
+                plink = PaginationLink.from_header(response.headers, direction="next")
+                # The next cursor is only known from the current page, so at most one page ahead
+                if prefetch and plink.results:
+                    pending = executor.submit(fetch, plink.url)
+                try:
+                    items = _iter_json_items(response) if stream else _decode_json(response)
+                    for item in items:
+                        if model is None:
+                            yield item
+                        else:
+                            yield model._from_json(transceiver=self, json=item, **kwargs)
+                        counter += 1
+                        if max_results is not None and counter >= max_results:
+                            return
+                finally:
+                    if stream:
+                        response.close()
+        finally:
+            if pending is not None and not pending.cancel():
+                pending.add_done_callback(_discard_response)
+
+    def paginate_get_batch(
+        self,
+        endpoint,
+        *,
+        params: Optional[Dict] = None,
+        columns: Optional[List[str]] = None,
+        max_results: int = None,
+        as_table: bool = False,
+    ) -> Union[Dict[str, List], "pyarrow.Table"]:
+        """Paginate endpoint and collect the results column by column
+
+        Instead of one object per result, every json key becomes one list holding its values of
+        all results. This suits analytical workloads filtering or reducing few keys of many results.
+
+        Args:
+            endpoint: The URL to send a get request to
+            params: Parameters to append to endpoint url
+            columns: Keys to collect, by default all keys found in any result
+            max_results: Return no more results, unlimited by default
+            as_table: Return a ``pyarrow.Table``, requires the optional dependency pyarrow
+        """
+        table = {key: [] for key in columns} if columns is not None else {}
+        rows = 0
+        for item in self.paginate_get(endpoint, params=params, max_results=max_results):
+            if columns is None:
+                for key in item:
+                    if key not in table:
+                        # Results lacking a key get None, also in earlier rows
+                        table[key] = [None] * rows
+            for key, values in table.items():
+                values.append(item.get(key))
+            rows += 1
+
+        if as_table:
+            import pyarrow
+
+            return pyarrow.table(table)
+        return table
 
     def post(
         self,
@@ -102,18 +301,18 @@ class Transceiver:
             model: If response_attribute is JSON, which class to instantiate
             **kwargs: Additional arguments for model class constructor
         """
-        response = requests.post(url=endpoint, headers=self.auth_headers, data=data)
+        response = self.session.post(url=endpoint, data=data)
         response.raise_for_status()
 
         # Return only parts of response that have been selected by response_attribute
         attr_mapper = {
             ResponseAttribute.ALL: lambda x: x,
-            ResponseAttribute.JSON: lambda x: x.json(),
+            ResponseAttribute.JSON: _decode_json,
             ResponseAttribute.HEADERS: lambda x: x.headers,
         }
         result = attr_mapper[response_attribute](response)
         if response_attribute == ResponseAttribute.JSON and model is not None:
-            return model(transceiver=self, json=result, **kwargs)
+            return model._from_json(transceiver=self, json=result, **kwargs)
         else:
             return result
 
@@ -137,28 +336,87 @@ class Transceiver:
             model: If response_attribute is JSON, which class to instantiate
             **kwargs: Additional arguments for model class constructor
         """
-        response = requests.put(url=endpoint, headers=self.auth_headers, params=params, data=data)
+        response = self.session.put(url=endpoint, params=params, data=data)
         response.raise_for_status()
 
         # Return only parts of response that have been selected by response_attribute
         attr_mapper = {
             ResponseAttribute.ALL: lambda x: x,
-            ResponseAttribute.JSON: lambda x: x.json(),
+            ResponseAttribute.JSON: _decode_json,
             ResponseAttribute.HEADERS: lambda x: x.headers,
         }
         result = attr_mapper[response_attribute](response)
         if response_attribute == ResponseAttribute.JSON and model is not None:
-            return model(transceiver=self, json=result, **kwargs)
+            return model._from_json(transceiver=self, json=result, **kwargs)
         else:
             return result
 
     def delete(self, endpoint: str):
         """Perform authenticated delete request and return HTTP response"""
-        response = requests.delete(url=endpoint, headers=self.auth_headers)
+        response = self.session.delete(url=endpoint)
         response.raise_for_status()
         return response
 
 
+def _decode_json(response: requests.Response) -> Any:
+    """Decode the json body of a response, failing like :meth:`requests.Response.json`"""
+    try:
+        return _loads(response.content)
+    except JSONDecodeError as e:
+        # Keep decode failures catchable as requests.RequestException, also with orjson
+        raise requests.JSONDecodeError(e.msg, e.doc, e.pos, response=response) from e
+
+
+def _send_get(
+    session: requests.Session, endpoint: str, *, params: Optional[Dict], stream: bool
+) -> requests.Response:
+    """Perform get request with the given session and raise for unsuccessful status codes"""
+    response = session.get(url=endpoint, params=params, stream=stream)
+    try:
+        response.raise_for_status()
+    except requests.HTTPError:
+        # A streamed body is not read, so its connection is only released by closing
+        response.close()
+        raise
+    return response
+
+
+@lru_cache(maxsize=64)
+def _auth_headers(token: str) -> Mapping[str, str]:
+    """Authorization header for a token, shared read-only by all transceivers using the token"""
+    return MappingProxyType({"Authorization": f"Bearer {token}"})
+
+
+def _iter_json_items(response: requests.Response) -> Iterator:
+    """Generate the elements of a streamed json array response as they are decoded"""
+    import ijson
+
+    response.raw.decode_content = True
+    return ijson.items(response.raw, "item", use_float=True)
+
+
+def _discard_response(future: Future):
+    """Release the connection of a prefetched page that is not consumed anymore"""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+_LINK_PATTERNS = {
+    direction: re.compile(
+        rf'<([^>]*)>;\s*rel="{direction}";\s*results="([^"]*)"(?:;\s*cursor="([^"]*)")?'
+    )
+    for direction in ["previous", "next"]
+}
+"""Matches one link of a ``Link`` header like ``<url>; rel="next"; results="true"; cursor="0:100:0"``"""
+
+
+def _request_key(endpoint: str, params: Optional[Dict]) -> Hashable:
+    """Identify a get request for caching, parameters are compared as sent in the query string"""
+    if not params:
+        return endpoint, ()
+    return endpoint, tuple(sorted((key, str(value)) for key, value in params.items()))
+
+
 @dataclass
 class PaginationLink:
     url: str
@@ -169,16 +427,8 @@ class PaginationLink:
     @classmethod
     def from_header(cls, header: Dict, direction: str) -> "PaginationLink":
         """Parses the response header and returns previous or next pagination link"""
-        index_map = {
-            "previous": 0,
-            "next": 1,
-        }
-        tokens = header["link"].split(", ")[index_map[direction]].split("; ")
-        raw = dict()
-        raw["url"] = tokens[0][1:-1]
-        for key in ["rel", "results", "cursor"]:
-            for t in tokens[1:]:
-                if key in t:
-                    raw[key] = t.split("=")[1][1:-1]
-        raw["results"] = True if raw["results"] == "true" else False
-        return cls(**raw)
+        match = _LINK_PATTERNS[direction].search(header["link"])
+        if match is None:
+            raise ValueError(f"No {direction} pagination link in header: {header['link']}")
+        url, results, cursor = match.groups()
+        return cls(url=url, results=results == "true", rel=direction, cursor=cursor)
@@ -15,6 +15,18 @@ setup(
         "requests",
     ],
     extras_require={
+        "speedups": [
+            "orjson",
+        ],
+        "numpy": [
+            "numpy",
+        ],
+        "pyarrow": [
+            "pyarrow",
+        ],
+        "stream": [
+            "ijson",
+        ],
         "dev": [
             "black",
             "enum-tools[sphinx]",
@@ -25,7 +37,7 @@ setup(
             "sphinx-rtd-theme",
             "twine",
             "wheel",
-        ]
+        ],
     },
     python_requires=">=3.8",
     project_urls={